@@ -0,0 +1,159 @@
+"""
+CUDA backend of the SEIZ step, built on CuPy.
+
+Used by SEIZModel(device="cuda"). The CSR adjacency, the state arrays and the
+random draws stay in GPU memory for the whole simulation. The step is a single
+CUDA kernel with one thread per node, and only the four state counts are
+copied back to the host when a step is recorded.
+
+This backend is experimental: it has not been run on GPU hardware yet, and
+its tests are skipped when CuPy is not installed.
+"""
+
+import numpy as np
+
+try:
+    import cupy as cp
+
+    CUPY_AVAILABLE = True
+except ImportError:  # CuPy is optional, it is only needed for device="cuda"
+    cp = None
+    CUPY_AVAILABLE = False
+
+THREADS_PER_BLOCK = 256
+
+# Same update as _kernels._seiz_step, applied to every node. States are coded
+# 0=S, 1=E, 2=I, 3=Z and the table is the flattened output of transition_table.
+_SEIZ_STEP_SOURCE = r"""
+extern "C" __global__
+void seiz_step(const long long* indptr, const int* indices, const signed char* states_in,
+               signed char* states_out, const long long n, const double prob_contact_I,
+               const double prob_contact_Z, const double* table, const double* rnd_node,
+               const double* rnd_edge)
+{
+    const long long u = (long long)blockDim.x * blockIdx.x + threadIdx.x;
+    if (u >= n) {
+        return;
+    }
+
+    const int state = states_in[u];
+    int source = 0;
+    if (state == 0) {
+        int n_infected = 0;
+        int n_skeptic = 0;
+        for (long long j = indptr[u]; j < indptr[u + 1]; ++j) {
+            const int nb_state = states_in[indices[j]];
+            if (nb_state == 2) {
+                n_infected += rnd_edge[j] < prob_contact_I;
+            } else if (nb_state == 3) {
+                n_skeptic += rnd_edge[j] < prob_contact_Z;
+            }
+        }
+        const int n_contacts = n_infected + n_skeptic;
+        if (n_contacts > 0) {
+            // Pick one of the successful contacts uniformly at random
+            source = rnd_node[2 * u] * n_contacts < n_infected ? 1 : 2;
+        }
+    }
+
+    const double* row = table + (state * 3 + source) * 4;
+    const double x = rnd_node[2 * u + 1];
+    states_out[u] = (signed char)((x >= row[0]) + (x >= row[1]) + (x >= row[2]));
+}
+"""
+
+_seiz_step = cp.RawKernel(_SEIZ_STEP_SOURCE, "seiz_step") if CUPY_AVAILABLE else None
+
+
+class CudaStepper:
+    """
+    GPU-resident state of a SEIZ simulation.
+
+    Holds device copies of the pull CSR adjacency, the transition table, the
+    double-buffered state array and the buffer of random draws, which are
+    generated on the device at each step.
+    """
+
+    __slots__ = ("indptr", "indices", "params", "table", "states", "next_states", "rng", "_rng_buf")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, params, table: np.ndarray):
+        """
+        Copy the graph to the GPU and allocate the device buffers.
+
+        Args:
+            indptr: CSR row offsets of the neighbors to pull from (int64, N + 1)
+            indices: CSR neighbor indices (int32)
+            params: SEIZParams with the per-step transition probabilities
+            table: Cumulative transition probabilities, see transition_table
+        """
+        if not CUPY_AVAILABLE:
+            raise ImportError(
+                "device='cuda' requires CuPy, see https://docs.cupy.dev/en/stable/install.html"
+            )
+
+        n = len(indptr) - 1
+        self.indptr = cp.asarray(indptr, dtype=cp.int64)
+        self.indices = cp.asarray(indices, dtype=cp.int32)
+        self.params = params
+        self.table = cp.asarray(table, dtype=cp.float64)
+        self.states = cp.zeros(n, dtype=cp.int8)
+        self.next_states = cp.empty_like(self.states)
+        self.rng = cp.random.default_rng()
+
+        # Uniform draws of one step: two per node, then one per CSR entry
+        self._rng_buf = cp.empty(2 * n + len(indices), dtype=cp.float64)
+
+    def upload(self, states: np.ndarray, seed: int) -> None:
+        """
+        Copy the host states to the GPU and reseed the device generator.
+
+        Args:
+            states: Host state array (int8, N)
+            seed: Seed of the device random number generator
+        """
+        self.states.set(states)
+        self.rng = cp.random.default_rng(seed)
+
+    def download(self, out: np.ndarray) -> None:
+        """
+        Copy the device states into a host array.
+
+        Args:
+            out: Host state array to fill (int8, N)
+        """
+        self.states.get(out=out)
+
+    def count_states(self) -> np.ndarray:
+        """
+        Count the nodes in each state on the GPU.
+
+        Returns:
+            Host array with the S, E, I, Z counts
+        """
+        return cp.bincount(self.states, minlength=4).get()
+
+    def step(self) -> None:
+        """Execute one synchronous update of every node on the GPU."""
+        n = self.states.shape[0]
+        if n == 0:
+            return
+
+        self.rng.random(out=self._rng_buf)
+        blocks = (n + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+        _seiz_step(
+            (blocks,),
+            (THREADS_PER_BLOCK,),
+            (
+                self.indptr,
+                self.indices,
+                self.states,
+                self.next_states,
+                np.int64(n),
+                np.float64(self.params.prob_contact_I),
+                np.float64(self.params.prob_contact_Z),
+                self.table,
+                self._rng_buf[: 2 * n],
+                self._rng_buf[2 * n :],
+            ),
+        )
+        self.states, self.next_states = self.next_states, self.states
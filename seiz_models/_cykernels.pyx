@@ -0,0 +1,131 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+C implementation of the SEIZ step kernel.
+
+Built by setup.py when Cython is available and used by _kernels when Numba is
+not installed. It mirrors _kernels._seiz_step and runs without the GIL, so
+simulations driven from several threads update in parallel.
+"""
+
+from libc.stdint cimport int8_t, int32_t, int64_t, uint8_t
+
+import numpy as np
+
+
+# State codes, as in base.py
+cdef enum:
+    S = 0
+    E = 1
+    I = 2
+    Z = 3
+
+
+cdef void _seiz_step(
+    const int64_t[::1] indptr,
+    const int32_t[::1] indices,
+    const int64_t[::1] push_indptr,
+    const int32_t[::1] push_indices,
+    const int64_t[::1] active_idx,
+    const int64_t[::1] edge_offsets,
+    const int8_t[::1] states_in,
+    int8_t[::1] states_out,
+    uint8_t[::1] active_out,
+    double prob_contact_I,
+    double prob_contact_Z,
+    const double[:, :, ::1] table,
+    const double[:, ::1] rnd_node,
+    const double[::1] rnd_edge,
+) noexcept nogil:
+    cdef Py_ssize_t k, u, j
+    cdef int64_t shift
+    cdef int8_t state, nb_state, new_state
+    cdef int source, n_infected, n_skeptic, n_contacts
+    cdef bint has_sources
+    cdef double x
+
+    for k in range(active_idx.shape[0]):
+        u = active_idx[k]
+        state = states_in[u]
+        source = 0
+
+        if state == S:
+            n_infected = 0
+            n_skeptic = 0
+            has_sources = False
+            shift = edge_offsets[k] - indptr[u]
+            for j in range(indptr[u], indptr[u + 1]):
+                nb_state = states_in[indices[j]]
+                if nb_state == I:
+                    has_sources = True
+                    if rnd_edge[shift + j] < prob_contact_I:
+                        n_infected += 1
+                elif nb_state == Z:
+                    has_sources = True
+                    if rnd_edge[shift + j] < prob_contact_Z:
+                        n_skeptic += 1
+
+            n_contacts = n_infected + n_skeptic
+            if n_contacts > 0:
+                # Pick one of the successful contacts uniformly at random
+                source = 1 if rnd_node[k, 0] * n_contacts < n_infected else 2
+
+            if has_sources:
+                active_out[u] = 1
+
+        x = rnd_node[k, 1]
+        new_state = (
+            (x >= table[state, source, 0])
+            + (x >= table[state, source, 1])
+            + (x >= table[state, source, 2])
+        )
+        states_out[u] = new_state
+
+        if new_state == E or new_state == I:
+            active_out[u] = 1
+        if new_state != state and (new_state == I or new_state == Z):
+            # New spreader: its neighbors may change state from the next step
+            for j in range(push_indptr[u], push_indptr[u + 1]):
+                active_out[push_indices[j]] = 1
+
+
+def seiz_step(
+    const int64_t[::1] indptr,
+    const int32_t[::1] indices,
+    const int64_t[::1] push_indptr,
+    const int32_t[::1] push_indices,
+    const int64_t[::1] active_idx,
+    const int64_t[::1] edge_offsets,
+    const int8_t[::1] states_in,
+    int8_t[::1] states_out,
+    active_out,
+    params,
+    const double[:, :, ::1] table,
+    const double[:, ::1] rnd_node,
+    const double[::1] rnd_edge,
+):
+    """
+    Perform one synchronous SEIZ update of the active nodes.
+
+    Args:
+        See _kernels._seiz_step.
+    """
+    cdef uint8_t[::1] active = active_out.view(np.uint8)
+    cdef double prob_contact_I = params.prob_contact_I
+    cdef double prob_contact_Z = params.prob_contact_Z
+    with nogil:
+        _seiz_step(
+            indptr,
+            indices,
+            push_indptr,
+            push_indices,
+            active_idx,
+            edge_offsets,
+            states_in,
+            states_out,
+            active,
+            prob_contact_I,
+            prob_contact_Z,
+            table,
+            rnd_node,
+            rnd_edge,
+        )
@@ -0,0 +1,332 @@
+"""
+Compiled step kernels for the SEIZ models.
+
+The kernels operate on the CSR adjacency and the int8 state array maintained by
+BaseEpidemicModel. They are compiled with Numba when it is installed, use the
+C extension built from _cykernels.pyx when Numba is missing, and run as a
+vectorized NumPy implementation when neither is available.
+
+Steps with at least PARALLEL_THRESHOLD active nodes are run by a multi-threaded
+variant of the kernel. The number of threads can be set with the
+NUMBA_NUM_THREADS environment variable (defaults to the number of cores).
+"""
+
+import types
+from typing import NamedTuple
+
+import numpy as np
+
+from .base import E, I, S, Z
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional, the NumPy fallback is used instead
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit."""
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+try:
+    from ._cykernels import seiz_step as _seiz_step_cython
+
+    CYTHON_AVAILABLE = True
+except ImportError:  # The C extension is only built when Cython is installed
+    CYTHON_AVAILABLE = False
+    _seiz_step_cython = None
+
+# Below this many nodes the threading overhead outweighs the parallel speedup
+PARALLEL_THRESHOLD = 50_000
+
+
+class SEIZParams(NamedTuple):
+    """Per-step transition probabilities of the SEIZ model, as used by the step kernel."""
+
+    prob_contact_I: float
+    prob_contact_Z: float
+    prob_E_to_I: float
+    prob_I_to_E: float
+    p: float
+    l: float
+
+
+def transition_table(params: SEIZParams) -> np.ndarray:
+    """
+    Build the lookup table of the per-node transitions.
+
+    Entry ``[state, source]`` holds the cumulative probabilities of moving to
+    S, E, I and Z, where source is 0 for a spontaneous transition, 1 after a
+    successful contact with an infected neighbor and 2 after one with a skeptic
+    neighbor. A uniform draw ``u`` selects the new state ``sum(u >= row[:3])``.
+
+    Args:
+        params: Per-step transition probabilities
+
+    Returns:
+        Cumulative transition probabilities (float64, 4 x 3 x 4)
+    """
+    table = np.empty((4, 3, 4), dtype=np.float64)
+    # Susceptible nodes stay S without a contact and follow the contact otherwise
+    table[S, 0] = (1.0, 1.0, 1.0, 1.0)
+    table[S, 1] = (0.0, 1.0 - params.p, 1.0, 1.0)
+    table[S, 2] = (0.0, 1.0 - params.l, 1.0 - params.l, 1.0)
+    # Contacts only affect susceptible nodes
+    table[E, :] = (0.0, 1.0 - params.prob_E_to_I, 1.0, 1.0)
+    table[I, :] = (0.0, params.prob_I_to_E, 1.0, 1.0)
+    table[Z, :] = (0.0, 0.0, 0.0, 1.0)
+    return table
+
+
+def _jit(func, name, **options):
+    """
+    Compile a renamed copy of a kernel.
+
+    Numba keys its on-disk cache by function name, so each compiled variant of
+    the same Python function needs its own name to get its own cache entry.
+
+    Args:
+        func: Python function to compile
+        name: Name of the compiled variant
+        **options: Options passed to numba.njit
+
+    Returns:
+        Compiled dispatcher
+    """
+    clone = types.FunctionType(
+        func.__code__, func.__globals__, name, func.__defaults__, func.__closure__
+    )
+    clone.__qualname__ = name
+    clone.__doc__ = func.__doc__
+    return njit(**options)(clone)
+
+
+def _seiz_step(
+    indptr,
+    indices,
+    push_indptr,
+    push_indices,
+    active_idx,
+    edge_offsets,
+    states_in,
+    states_out,
+    active_out,
+    params,
+    table,
+    rnd_node,
+    rnd_edge,
+):
+    """
+    Perform one synchronous SEIZ update of the active nodes.
+
+    States are read from ``states_in`` and written to ``states_out`` so that
+    every node sees the configuration of the previous step. Each susceptible
+    node draws one contact per infected/skeptic neighbor and, if any succeed,
+    picks one successful contact uniformly at random as the source of its
+    transition. The new state of every node is then sampled from the row of
+    the transition table given by its state and source, without branching on
+    the state.
+
+    Only the nodes in ``active_idx`` are visited: susceptible nodes with an
+    infected or skeptic neighbor, and exposed or infected nodes. Every other
+    node keeps its state, so ``states_out`` must hold a copy of ``states_in``.
+    The active nodes of the next step are flagged in ``active_out``, which must
+    be cleared beforehand; flags are only ever set, so concurrent writes are safe.
+
+    Args:
+        indptr: CSR row offsets (int64, N + 1) of the neighbors to pull from
+        indices: CSR neighbor indices (int32)
+        push_indptr: CSR row offsets of the neighbors a node spreads to
+        push_indices: CSR neighbor indices of the neighbors a node spreads to
+        active_idx: Indices of the active nodes
+        edge_offsets: Offset of the edge draws of each active node (int64, A + 1)
+        states_in: Current states (int8, N)
+        states_out: Output buffer for the new states (int8, N)
+        active_out: Output flags of the next active nodes (bool, N)
+        params: SEIZParams with the per-step transition probabilities
+        table: Cumulative transition probabilities, see transition_table
+        rnd_node: Uniform draws per active node (float64, A x 2)
+        rnd_edge: Uniform draws per edge of the active nodes (float64, edge_offsets[-1])
+    """
+    prob_contact_I = params.prob_contact_I
+    prob_contact_Z = params.prob_contact_Z
+    for k in prange(active_idx.shape[0]):
+        u = active_idx[k]
+        state = states_in[u]
+        source = 0
+
+        if state == S:
+            n_infected = 0
+            n_skeptic = 0
+            has_sources = False
+            shift = edge_offsets[k] - indptr[u]
+            for j in range(indptr[u], indptr[u + 1]):
+                nb_state = states_in[indices[j]]
+                if nb_state == I:
+                    has_sources = True
+                    if rnd_edge[shift + j] < prob_contact_I:
+                        n_infected += 1
+                elif nb_state == Z:
+                    has_sources = True
+                    if rnd_edge[shift + j] < prob_contact_Z:
+                        n_skeptic += 1
+
+            n_contacts = n_infected + n_skeptic
+            if n_contacts > 0:
+                # Pick one of the successful contacts uniformly at random
+                source = 1 if rnd_node[k, 0] * n_contacts < n_infected else 2
+
+            if has_sources:
+                active_out[u] = True
+
+        row = table[state, source]
+        x = rnd_node[k, 1]
+        new_state = int(x >= row[0]) + int(x >= row[1]) + int(x >= row[2])
+        states_out[u] = new_state
+
+        if new_state == E or new_state == I:
+            active_out[u] = True
+        if new_state != state and (new_state == I or new_state == Z):
+            # New spreader: its neighbors may change state from the next step
+            for j in range(push_indptr[u], push_indptr[u + 1]):
+                active_out[push_indices[j]] = True
+
+
+_seiz_step_serial = _jit(_seiz_step, "_seiz_step_serial", cache=True, fastmath=True)
+_seiz_step_parallel = _jit(
+    _seiz_step, "_seiz_step_parallel", cache=True, fastmath=True, parallel=True
+)
+
+
+def _csr_row_slots(indptr, rows):
+    """
+    Get the positions in the CSR indices of the entries of the given rows.
+
+    Args:
+        indptr: CSR row offsets (int64, N + 1)
+        rows: Row indices
+
+    Returns:
+        Tuple (slots, counts): CSR positions of the entries, row after row, and
+        the number of entries of each row
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    ends = np.cumsum(counts)
+    slots = np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - ends + counts, counts)
+    return slots, counts
+
+
+def _seiz_step_numpy(
+    indptr,
+    indices,
+    push_indptr,
+    push_indices,
+    active_idx,
+    edge_offsets,
+    states_in,
+    states_out,
+    active_out,
+    params,
+    table,
+    rnd_node,
+    rnd_edge,
+):
+    """
+    Vectorized NumPy equivalent of _seiz_step.
+
+    Contacts are evaluated on the edge list of the active nodes at once and the
+    successful ones are scatter-added into per-node counts, so no per-node
+    Python loop is needed. Given the same random draws it produces the same
+    states and the same next active nodes.
+
+    Args:
+        See _seiz_step.
+    """
+    n_active = active_idx.shape[0]
+    slots, counts = _csr_row_slots(indptr, active_idx)
+    row = np.repeat(np.arange(n_active), counts)
+
+    state = states_in[active_idx]
+    nb_states = states_in[indices[slots]]
+    pulls = state[row] == S
+    from_I = pulls & (nb_states == I)
+    from_Z = pulls & (nb_states == Z)
+    has_sources = np.bincount(row[from_I | from_Z], minlength=n_active) > 0
+    n_infected = np.bincount(row[from_I & (rnd_edge < params.prob_contact_I)], minlength=n_active)
+    n_skeptic = np.bincount(row[from_Z & (rnd_edge < params.prob_contact_Z)], minlength=n_active)
+    n_contacts = n_infected + n_skeptic
+
+    contacted = n_contacts > 0
+    source = np.zeros(n_active, dtype=np.intp)
+    source[contacted] = np.where(
+        rnd_node[contacted, 0] * n_contacts[contacted] < n_infected[contacted], 1, 2
+    )
+
+    rows = table[state, source]
+    new_state = (rnd_node[:, 1, None] >= rows[:, :3]).sum(axis=1).astype(np.int8)
+    states_out[active_idx] = new_state
+
+    active_out[active_idx[has_sources | (new_state == E) | (new_state == I)]] = True
+    spreaders = active_idx[(new_state != state) & ((new_state == I) | (new_state == Z))]
+    spread_slots, _ = _csr_row_slots(push_indptr, spreaders)
+    active_out[push_indices[spread_slots]] = True
+
+
+def seiz_step_kernel(*args):
+    """
+    Perform one synchronous SEIZ update with the fastest available kernel.
+
+    Uses the Numba kernel when Numba is installed (in parallel when there are
+    many active nodes), then the C extension, then the vectorized NumPy
+    implementation.
+
+    Args:
+        *args: Graph, frontier, states, parameters and random draws, see _seiz_step
+    """
+    active_idx = args[4]
+    if NUMBA_AVAILABLE:
+        if active_idx.shape[0] >= PARALLEL_THRESHOLD:
+            _seiz_step_parallel(*args)
+        else:
+            _seiz_step_serial(*args)
+    elif CYTHON_AVAILABLE:
+        _seiz_step_cython(*args)
+    else:
+        _seiz_step_numpy(*args)
+
+
+def warm_up():
+    """
+    Compile the serial step kernel in the current process.
+
+    Runs the kernel once on a one-node graph, which compiles it or loads it from
+    the on-disk cache. Processes forked afterwards inherit the compiled code.
+    The parallel kernel is not warmed up because compiling it starts Numba's
+    thread pool, which is not safe to fork.
+    """
+    if NUMBA_AVAILABLE:
+        indptr = np.zeros(2, dtype=np.int64)
+        indices = np.zeros(0, dtype=np.int32)
+        _seiz_step_serial(
+            indptr,
+            indices,
+            indptr,
+            indices,
+            np.zeros(1, dtype=np.int64),
+            np.zeros(2, dtype=np.int64),
+            np.zeros(1, dtype=np.int8),
+            np.zeros(1, dtype=np.int8),
+            np.zeros(1, dtype=np.bool_),
+            SEIZParams(0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+            np.zeros((4, 3, 4), dtype=np.float64),
+            np.zeros((1, 2), dtype=np.float64),
+            np.zeros(0, dtype=np.float64),
+        )
@@ -6,11 +6,101 @@ for all SEIZ epidemic models.
 """
 
 import json
+import multiprocessing
+import os
+import sys
 from abc import ABC, abstractmethod
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Any, Dict, List, Optional
 
-import matplotlib.pyplot as plt
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup for JSON export
+    orjson = None
+
+# Integer codes used to store agent states in the int8 state array
+S, E, I, Z = 0, 1, 2, 3
+STATE_LABELS = ("S", "E", "I", "Z")
+STATE_CODES = {label: code for code, label in enumerate(STATE_LABELS)}
+STATE_LUT = np.array(STATE_LABELS)
+
+# Number of recorded steps above which plotted lines are rasterized
+RASTERIZE_THRESHOLD = 10_000
+
+
+class BaseAgent:
+    """Agent whose state is stored in the owning model's state array."""
+
+    __slots__ = ("_states", "_idx")
+
+    def __init__(self, states: np.ndarray, idx: int, state: str = "S"):
+        self._states = states
+        self._idx = idx
+        self.state = state
+
+    @property
+    def state(self) -> str:
+        """Current state label (S, E, I or Z)."""
+        return STATE_LABELS[self._states[self._idx]]
+
+    @state.setter
+    def state(self, value: str) -> None:
+        self._states[self._idx] = STATE_CODES[value]
+
+
+def _numba_threads_started() -> bool:
+    """
+    Whether Numba's parallel thread pool may be running in the current process.
+
+    Forking a process that runs the thread pool can leave the children (and
+    the parent, on exit) hanging, so this errs on the side of True when the
+    state of the pool cannot be determined.
+    """
+    if "numba" not in sys.modules:
+        return False
+    try:
+        from numba.np.ufunc import parallel
+    except ImportError:
+        return True
+    return getattr(parallel, "_is_initialized", True)
+
+
+# Model instance reused by all the runs executed in an ensemble worker process
+_ensemble_model = None
+
+
+def _init_ensemble_worker(cls, graph, params: Dict[str, Any], n_threads: int) -> None:
+    """
+    Build the model once per ensemble worker process.
+
+    The ensemble is the outer layer of parallelism, so Numba's parallel kernel
+    is limited to the worker's share of the cores instead of using them all.
+
+    Args:
+        cls: Model class
+        graph: networkx.Graph - Social network of agents
+        params: Model-specific parameters
+        n_threads: Maximum number of Numba threads in this worker
+    """
+    global _ensemble_model
+    _ensemble_model = cls(graph, **params)
+
+    # Imported by the model module when the kernels are compiled with Numba
+    numba = sys.modules.get("numba")
+    if numba is not None:
+        numba.set_num_threads(min(n_threads, numba.config.NUMBA_NUM_THREADS))
+
+
+def _run_ensemble_member(
+    seed: int, steps: int, infected_frac: float, skeptic_frac: float
+) -> np.ndarray:
+    """Run one simulation of an ensemble and return its history buffer."""
+    _ensemble_model.initialize_states(infected_frac, skeptic_frac, seed=seed)
+    _ensemble_model._simulate(steps)
+    return _ensemble_model._history_arr
 
 
 class BaseEpidemicModel(ABC):
@@ -23,8 +113,35 @@ class BaseEpidemicModel(ABC):
     - Step-wise execution
     - JSON output
     - Visualization
+
+    Nodes are relabeled once to contiguous indices 0..N-1, their position in
+    ``self._nodes_orig``; ``self._node_idx`` maps original labels back to
+    indices. Agent states are stored in ``self._states``, a contiguous int8
+    array (0=S, 1=E, 2=I, 3=Z) indexed this way, and the adjacency in the
+    ``indptr``/``indices`` CSR arrays. Simulation code works on indices only;
+    original labels are only used when results are exported. Subclasses must
+    keep the state array up to date, updating it in place, and list the
+    attributes they add in their own ``__slots__``.
     """
 
+    # Fixed attribute layout: no per-instance __dict__, which keeps the many
+    # models created by ensemble runs small. Subclasses declare their own slots.
+    __slots__ = (
+        "__weakref__",
+        "graph",
+        "params",
+        "_current_step",
+        "_nodes_orig",
+        "_node_idx",
+        "_states",
+        "indptr",
+        "indices",
+        "rng",
+        "_history_arr",
+        "_history_steps",
+        "_history_cache",
+    )
+
     def __init__(self, graph, **params):
         """
         Initialize the model.
@@ -35,9 +152,66 @@ class BaseEpidemicModel(ABC):
         """
         self.graph = graph
         self.params = params
-        self.history = []
         self._current_step = 0
 
+        # Fixed node -> index mapping used by the state array
+        self._nodes_orig = list(graph.nodes())
+        self._node_idx = {node: i for i, node in enumerate(self._nodes_orig)}
+        self._states = np.zeros(len(self._nodes_orig), dtype=np.int8)
+
+        # CSR adjacency: neighbors of node i are indices[indptr[i]:indptr[i + 1]]
+        self.indptr, self.indices = self._build_csr()
+
+        # Random number generator, reseeded by initialize_states()
+        self.rng = np.random.default_rng()
+
+        # State counts per step (columns: S, E, I, Z), filled by run()
+        self._history_arr = np.empty((0, 4), dtype=np.int32)
+        self._history_steps = np.empty(0, dtype=np.int32)
+        self._history_cache = None
+
+    def _build_csr(self, reverse: bool = False):
+        """
+        Build the CSR adjacency arrays of the graph.
+
+        Row i lists the neighbors of ``self._nodes_orig[i]`` as contiguous int32
+        indices, in ``graph.neighbors()`` order: undirected edges appear in both
+        endpoint rows (self-loops once), directed edges only in the source row.
+
+        Args:
+            reverse: Index directed edges by their target (predecessor lists)
+
+        Returns:
+            Tuple (indptr, indices) of int64 row offsets and int32 neighbor indices
+        """
+        n = len(self._nodes_orig)
+        node_idx = self._node_idx
+        adj = self.graph.pred if reverse and self.graph.is_directed() else self.graph.adj
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter((len(adj[node]) for node in self._nodes_orig), dtype=np.int64, count=n),
+            out=indptr[1:],
+        )
+        indices = np.fromiter(
+            (node_idx[nb] for node in self._nodes_orig for nb in adj[node]),
+            dtype=np.int32,
+            count=indptr[-1],
+        )
+        return indptr, indices
+
+    def neighbors(self, idx: int) -> np.ndarray:
+        """
+        Get the neighbors of a node from the CSR adjacency.
+
+        Args:
+            idx: Index of the node in the state array
+
+        Returns:
+            View of the neighbor indices
+        """
+        return self.indices[self.indptr[idx] : self.indptr[idx + 1]]
+
     @abstractmethod
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -58,14 +232,38 @@ class BaseEpidemicModel(ABC):
         pass
 
     @abstractmethod
+    def get_states_array(self) -> np.ndarray:
+        """
+        Get current states of all agents as an int8 array.
+
+        The array is a read-only view of the model's state buffer (no copy),
+        indexed like ``graph.nodes()``. It is only guaranteed to reflect the
+        current states until the next call to step().
+
+        Returns:
+            Array of state codes (0=S, 1=E, 2=I, 3=Z)
+        """
+        pass
+
     def get_states(self) -> Dict[Any, str]:
         """
         Get current states of all agents.
 
+        The dictionary is materialized from get_states_array() on each call.
+
         Returns:
             Dictionary mapping node -> state
         """
-        pass
+        return dict(zip(self._nodes_orig, STATE_LUT[self.get_states_array()].tolist()))
+
+    def _count_states_fast(self) -> np.ndarray:
+        """
+        Count the number of agents in each state without building any dict.
+
+        Returns:
+            Array with the counts of S, E, I, Z (in this order)
+        """
+        return np.bincount(self.get_states_array(), minlength=4)
 
     def count_states(self) -> Dict[str, int]:
         """
@@ -74,48 +272,238 @@ class BaseEpidemicModel(ABC):
         Returns:
             Dictionary with counts for each state (S, E, I, Z)
         """
-        states = self.get_states()
-        counts = Counter(states.values())
-        # Ensure all states are present
-        for state in ["S", "E", "I", "Z"]:
-            if state not in counts:
-                counts[state] = 0
-        return dict(counts)
+        counts = self._count_states_fast()
+        return {label: int(count) for label, count in zip(STATE_LABELS, counts)}
 
-    def run(self, steps: int = 100) -> List[Dict[str, int]]:
+    def run(self, steps: int = 100, history_every: int = 1) -> List[Dict[str, int]]:
         """
         Run the simulation for a specified number of steps.
 
         Args:
             steps: Number of simulation steps
+            history_every: Record the state counts every this many steps
+                           (the final state is always recorded)
 
         Returns:
-            List of state count dictionaries for each step
+            List of state count dictionaries for each recorded step
         """
-        self.history = []
+        self._simulate(steps, history_every)
+        return self.history
+
+    def _simulate(self, steps: int, history_every: int = 1) -> None:
+        """
+        Run the simulation, recording the state counts in the history buffer only.
+
+        Args:
+            steps: Number of simulation steps
+            history_every: Record the state counts every this many steps
+                           (the final state is always recorded)
+        """
+        if steps < 0:
+            raise ValueError("steps must be a non-negative integer")
+        if history_every < 1:
+            raise ValueError("history_every must be a positive integer")
+
+        recorded = np.arange(0, steps + 1, history_every, dtype=np.int32)
+        if recorded[-1] != steps:
+            recorded = np.append(recorded, np.int32(steps))
+        self._history_steps = recorded
+        self._history_arr = np.empty((len(recorded), 4), dtype=np.int32)
+        self._history_cache = None
+
+        row = 0
         for step in range(steps):
             self._current_step = step
-            counts = self.count_states()
-            counts["step"] = step
-            self.history.append(counts)
+            if step % history_every == 0:
+                self._history_arr[row] = self._count_states_fast()
+                row += 1
             self.step()
 
         # Record final state
-        counts = self.count_states()
-        counts["step"] = steps
-        self.history.append(counts)
+        self._history_arr[-1] = self._count_states_fast()
 
-        return self.history
+    def _history_buffers(self):
+        """
+        Get the recorded steps and state counts as arrays.
+
+        Once the history list has been handed out it is the reference, so any
+        in-place edits made to it are reflected in exports and plots.
 
-    def to_json(self, indent: int = 2) -> str:
+        Returns:
+            Tuple (steps, counts) of int32 arrays, counts with columns S, E, I, Z
         """
-        Export simulation results to JSON format.
+        records = self._history_cache
+        if records is None:
+            return self._history_steps, self._history_arr
+
+        steps = np.array([r["step"] for r in records], dtype=np.int32)
+        counts = np.array(
+            [[r[label] for label in STATE_LABELS] for r in records], dtype=np.int32
+        ).reshape(-1, 4)
+        return steps, counts
+
+    def _history_length(self) -> int:
+        """Number of recorded steps."""
+        if self._history_cache is not None:
+            return len(self._history_cache)
+        return len(self._history_steps)
+
+    def _history_records(self, history_every: int = 1) -> List[Dict[str, int]]:
+        """
+        Build the list of state count dictionaries from the history buffer.
+
+        Args:
+            history_every: Keep only the steps that are a multiple of this value
+                           (the final state is always kept)
+
+        Returns:
+            List of state count dictionaries
+        """
+        if history_every < 1:
+            raise ValueError("history_every must be a positive integer")
+        if history_every == 1 and self._history_cache is not None:
+            return self._history_cache
+
+        steps, counts = self._history_buffers()
+        if history_every > 1 and len(steps) > 0:
+            keep = steps % history_every == 0
+            keep[-1] = True
+            steps, counts = steps[keep], counts[keep]
+
+        return [
+            {"S": s, "E": e, "I": i, "Z": z, "step": step}
+            for step, (s, e, i, z) in zip(steps.tolist(), counts.tolist())
+        ]
+
+    @property
+    def history(self) -> List[Dict[str, int]]:
+        """
+        State counts recorded by the last run.
+
+        The list is built from the history buffer on first access and cached
+        until the next run. The cached list is then what to_json(), save_json()
+        and the plots export, so edits made to it in place are kept consistent.
+
+        Returns:
+            List of state count dictionaries for each recorded step
+        """
+        if self._history_cache is None:
+            self._history_cache = self._history_records()
+        return self._history_cache
+
+    @history.setter
+    def history(self, records: List[Dict[str, int]]) -> None:
+        """
+        Replace the recorded state counts.
+
+        Args:
+            records: List of state count dictionaries with a "step" key
+        """
+        self._history_cache = list(records)
+        self._history_steps, self._history_arr = self._history_buffers()
+
+    @classmethod
+    def run_ensemble(
+        cls,
+        graph,
+        n_runs: int,
+        steps: int,
+        params: Dict[str, Any],
+        n_workers: Optional[int] = None,
+        infected_frac: float = 0.05,
+        skeptic_frac: float = 0.05,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Run independent simulations in parallel worker processes.
+
+        Each worker builds the model (and its CSR adjacency) once and reuses it
+        for all the runs assigned to it, so the graph is sent to each process
+        only once. The workers split the cores between them: each one runs
+        Numba's parallel kernel on at most ``cpu_count // n_workers`` threads.
+
+        Args:
+            graph: networkx.Graph - Social network of agents
+            n_runs: Number of independent simulations
+            steps: Number of simulation steps per run
+            params: Model-specific parameters
+            n_workers: Number of worker processes (defaults to the number of CPUs)
+            infected_frac: Fraction of initially infected agents
+            skeptic_frac: Fraction of initially skeptic agents
+            seed: Master seed from which the seed of each run is derived
+
+        Returns:
+            Array of shape (n_runs, steps + 1, 4) with the S, E, I, Z counts (int32)
+        """
+        if n_runs < 1:
+            raise ValueError("n_runs must be a positive integer")
+
+        # Independent child streams of the master seed, one per run, each passed
+        # on as a 128-bit integer so that runs do not collide on a seed
+        seeds = [
+            int.from_bytes(child.generate_state(4).tobytes(), "little")
+            for child in np.random.SeedSequence(seed).spawn(n_runs)
+        ]
+
+        # Share the cores between the workers so that runs going through the
+        # parallel kernel do not oversubscribe the machine
+        n_cpus = os.cpu_count() or 1
+        n_procs = min(n_workers or n_cpus, n_runs)
+        n_threads = max(1, n_cpus // n_procs)
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=cls._ensemble_context(),
+            initializer=_init_ensemble_worker,
+            initargs=(cls, graph, params, n_threads),
+        ) as executor:
+            histories = list(
+                executor.map(
+                    _run_ensemble_member,
+                    seeds,
+                    repeat(steps),
+                    repeat(infected_frac),
+                    repeat(skeptic_frac),
+                )
+            )
+
+        return np.stack(histories)
+
+    @classmethod
+    def _ensemble_context(cls) -> multiprocessing.context.BaseContext:
+        """
+        Get the multiprocessing context used to start ensemble workers.
+
+        Workers are forked only where fork is already the platform's default
+        start method and no Numba threads are running in this process, since
+        forking a running thread pool can hang. Otherwise they are spawned.
+        Subclasses relying on JIT-compiled kernels can override this to compile
+        them in the parent process before the workers are started.
+
+        Returns:
+            Multiprocessing context for the ensemble workers
+        """
+        # The default start method is listed first
+        method = multiprocessing.get_start_method(allow_none=True)
+        if method is None:
+            method = multiprocessing.get_all_start_methods()[0]
+        if method == "fork" and not _numba_threads_started():
+            return multiprocessing.get_context("fork")
+        return multiprocessing.get_context("spawn")
+
+    def _to_json_bytes(self, indent: Optional[int] = 2, history_every: int = 1) -> bytes:
+        """
+        Serialize simulation results to UTF-8 encoded JSON.
+
+        Uses orjson when it is installed and the requested indentation is
+        supported (``None`` or 2), otherwise falls back to the standard library.
 
         Args:
             indent: JSON indentation level
+            history_every: Export only the steps that are a multiple of this value
 
         Returns:
-            JSON string with model parameters and history
+            Encoded JSON document with model parameters and history
         """
         output = {
             "model_type": self.__class__.__name__,
@@ -124,19 +512,77 @@ class BaseEpidemicModel(ABC):
                 "num_nodes": self.graph.number_of_nodes(),
                 "num_edges": self.graph.number_of_edges(),
             },
-            "history": self.history,
+            "history": self._history_records(history_every),
         }
-        return json.dumps(output, indent=indent)
+        if orjson is not None and indent in (None, 2):
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(output, option=option)
+        return json.dumps(output, indent=indent).encode("utf-8")
+
+    def to_json(self, indent: Optional[int] = 2, history_every: int = 1) -> str:
+        """
+        Export simulation results to JSON format.
+
+        Args:
+            indent: JSON indentation level
+            history_every: Export only the steps that are a multiple of this value
+                           (the final state is always exported)
 
-    def save_json(self, filepath: str) -> None:
+        Returns:
+            JSON string with model parameters and history
+        """
+        return self._to_json_bytes(indent, history_every).decode("utf-8")
+
+    def save_json(self, filepath: str, history_every: int = 1) -> None:
         """
         Save simulation results to a JSON file.
 
         Args:
             filepath: Path to output JSON file
+            history_every: Save only the steps that are a multiple of this value
+                           (the final state is always saved)
+        """
+        with open(filepath, "wb") as f:
+            f.write(self._to_json_bytes(history_every=history_every))
+
+    def _render(self, ax: Any, title: Optional[str] = None) -> None:
         """
-        with open(filepath, "w") as f:
-            f.write(self.to_json())
+        Draw the time series of state counts on the given axes.
+
+        Args:
+            ax: Matplotlib axes to draw on
+            title: Plot title (uses model name if not provided)
+        """
+        if title is None:
+            title = f"{self.__class__.__name__} Dynamics"
+
+        steps, counts = self._history_buffers()
+        # Long traces are rasterized to keep vector outputs (SVG/PDF) small
+        rasterized = len(steps) > RASTERIZE_THRESHOLD
+
+        series = [
+            ("Susceptible (S)", "blue"),
+            ("Exposed (E)", "orange"),
+            ("Infected (I)", "red"),
+            ("Skeptic (Z)", "green"),
+        ]
+        for col, (label, color) in enumerate(series):
+            ax.plot(
+                steps,
+                counts[:, col],
+                label=label,
+                color=color,
+                linewidth=2,
+                rasterized=rasterized,
+            )
+
+        ax.set_xlabel("Time Steps", fontsize=12)
+        ax.set_ylabel("Number of Agents", fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight="bold")
+        ax.legend(loc="best", fontsize=10)
+        ax.grid(True, alpha=0.3)
 
     def plot(self, title: Optional[str] = None, figsize: tuple = (10, 6)) -> None:
         """
@@ -146,30 +592,14 @@ class BaseEpidemicModel(ABC):
             title: Plot title (uses model name if not provided)
             figsize: Figure size (width, height)
         """
-        if not self.history:
+        if self._history_length() == 0:
             raise ValueError("No history to plot. Run the simulation first.")
 
-        if title is None:
-            title = f"{self.__class__.__name__} Dynamics"
+        import matplotlib.pyplot as plt
 
-        steps = [h["step"] for h in self.history]
-        s_counts = [h["S"] for h in self.history]
-        e_counts = [h["E"] for h in self.history]
-        i_counts = [h["I"] for h in self.history]
-        z_counts = [h["Z"] for h in self.history]
-
-        plt.figure(figsize=figsize)
-        plt.plot(steps, s_counts, label="Susceptible (S)", color="blue", linewidth=2)
-        plt.plot(steps, e_counts, label="Exposed (E)", color="orange", linewidth=2)
-        plt.plot(steps, i_counts, label="Infected (I)", color="red", linewidth=2)
-        plt.plot(steps, z_counts, label="Skeptic (Z)", color="green", linewidth=2)
-
-        plt.xlabel("Time Steps", fontsize=12)
-        plt.ylabel("Number of Agents", fontsize=12)
-        plt.title(title, fontsize=14, fontweight="bold")
-        plt.legend(loc="best", fontsize=10)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        fig, ax = plt.subplots(figsize=figsize)
+        self._render(ax, title)
+        fig.tight_layout()
         plt.show()
 
     def save_plot(
@@ -184,32 +614,18 @@ class BaseEpidemicModel(ABC):
             figsize: Figure size (width, height)
             dpi: Resolution in dots per inch
         """
-        if not self.history:
+        if self._history_length() == 0:
             raise ValueError("No history to plot. Run the simulation first.")
 
-        if title is None:
-            title = f"{self.__class__.__name__} Dynamics"
+        # A standalone Figure renders off-screen without going through pyplot,
+        # so no GUI backend or display connection is ever initialized
+        from matplotlib.figure import Figure
 
-        steps = [h["step"] for h in self.history]
-        s_counts = [h["S"] for h in self.history]
-        e_counts = [h["E"] for h in self.history]
-        i_counts = [h["I"] for h in self.history]
-        z_counts = [h["Z"] for h in self.history]
-
-        plt.figure(figsize=figsize)
-        plt.plot(steps, s_counts, label="Susceptible (S)", color="blue", linewidth=2)
-        plt.plot(steps, e_counts, label="Exposed (E)", color="orange", linewidth=2)
-        plt.plot(steps, i_counts, label="Infected (I)", color="red", linewidth=2)
-        plt.plot(steps, z_counts, label="Skeptic (Z)", color="green", linewidth=2)
-
-        plt.xlabel("Time Steps", fontsize=12)
-        plt.ylabel("Number of Agents", fontsize=12)
-        plt.title(title, fontsize=14, fontweight="bold")
-        plt.legend(loc="best", fontsize=10)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=dpi, bbox_inches="tight")
-        plt.close()
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
+        self._render(ax, title)
+        fig.tight_layout()
+        fig.savefig(filepath, dpi=dpi, bbox_inches="tight")
 
     def animate_network(
         self,
@@ -247,6 +663,7 @@ class BaseEpidemicModel(ABC):
             >>> # To save: model.animate_network(steps=50, save_path='diffusion.mp4')
         """
         try:
+            import matplotlib.pyplot as plt
             import networkx as nx
             from matplotlib.animation import FuncAnimation
         except ImportError as e:
@@ -256,15 +673,11 @@ class BaseEpidemicModel(ABC):
             ) from e
 
         # Check that initial states are set
-        initial_states = self.get_states()
-        if not initial_states:
+        if len(self.get_states_array()) == 0:
             raise ValueError(
                 "States must be initialized before animation. " "Call initialize_states() first."
             )
 
-        # Store original history to restore after animation
-        original_history = self.history.copy()
-
         # Compute layout once for consistency
         pos = nx.spring_layout(self.graph, seed=seed)
 
@@ -278,6 +691,7 @@ class BaseEpidemicModel(ABC):
             "I": "#d62728",  # red
             "Z": "#2ca02c",  # green
         }
+        color_lut = np.array([state_colors[label] for label in STATE_LABELS])
 
         def update(frame):
             """Update function for animation."""
@@ -288,8 +702,7 @@ class BaseEpidemicModel(ABC):
                 self.step()
 
             # Get current states and map to colors
-            states = self.get_states()
-            node_colors = [state_colors.get(states[node], "#cccccc") for node in self.graph.nodes()]
+            node_colors = color_lut[self.get_states_array()].tolist()
 
             # Count states for display
             counts = self.count_states()
@@ -353,8 +766,5 @@ class BaseEpidemicModel(ABC):
             else:
                 raise ValueError("save_path must end with .gif or .mp4")
 
-        # Restore original history
-        self.history = original_history
-
         plt.tight_layout()
         return anim
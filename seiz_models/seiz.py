@@ -5,13 +5,14 @@ This module implements the basic SEIZ model without any moderation mechanisms.
 """
 
 import math
-import random
-from collections import defaultdict
-from typing import Any, Dict, Optional
+import multiprocessing
+from typing import Optional
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from ._kernels import SEIZParams, seiz_step_kernel, transition_table, warm_up
+from .base import BaseEpidemicModel, E, I, S, Z
 
 
 def rate_to_prob(rate: float, dt: float) -> float:
@@ -37,8 +38,35 @@ class SEIZModel(BaseEpidemicModel):
         p: Probability S -> I after contact with I
         l: Probability S -> Z after contact with Z
         dt: Time step size for rate conversion (default: 1.0)
+        device: "cpu", or "cuda" to run the simulation on the GPU with CuPy
+                (experimental, not yet validated on GPU hardware)
     """
 
+    __slots__ = (
+        "beta",
+        "b",
+        "rho",
+        "eps",
+        "p",
+        "l",
+        "dt",
+        "device",
+        "prob_contact_I",
+        "prob_contact_Z",
+        "prob_E_to_I",
+        "prob_I_to_E",
+        "_p",
+        "_table",
+        "_pull_indptr",
+        "_pull_indices",
+        "_pull_degree",
+        "_next_states",
+        "_active",
+        "_next_active",
+        "_rng_buf",
+        "_cuda",
+    )
+
     def __init__(
         self,
         graph: nx.Graph,
@@ -49,6 +77,7 @@ class SEIZModel(BaseEpidemicModel):
         p: float,
         l: float,
         dt: float = 1.0,
+        device: str = "cpu",
     ):
         """
         Initialize the SEIZ model.
@@ -62,7 +91,13 @@ class SEIZModel(BaseEpidemicModel):
             p: Probability S -> I after contact with I
             l: Probability S -> Z after contact with Z
             dt: Time step size
+            device: "cpu", or "cuda" to keep the graph and states in GPU memory
+                    and run every step there (requires CuPy). The CUDA backend is
+                    experimental: it has not been validated on GPU hardware yet.
         """
+        if device not in ("cpu", "cuda"):
+            raise ValueError(f"Unknown device {device!r}, expected 'cpu' or 'cuda'")
+
         params = {"beta": beta, "b": b, "rho": rho, "eps": eps, "p": p, "l": l, "dt": dt}
         super().__init__(graph, **params)
 
@@ -73,6 +108,7 @@ class SEIZModel(BaseEpidemicModel):
         self.p = p
         self.l = l
         self.dt = dt
+        self.device = device
 
         # Convert rates to probabilities
         self.prob_contact_I = rate_to_prob(beta, dt)
@@ -80,10 +116,42 @@ class SEIZModel(BaseEpidemicModel):
         self.prob_E_to_I = rate_to_prob(rho, dt)
         self.prob_I_to_E = rate_to_prob(eps, dt)
 
-        # Initialize states dictionary
-        self.states = {}
-        for node in self.graph.nodes():
-            self.states[node] = "S"
+        # Frozen copy of the probabilities, passed to the kernel as a plain struct
+        self._p = SEIZParams(
+            float(self.prob_contact_I),
+            float(self.prob_contact_Z),
+            float(self.prob_E_to_I),
+            float(self.prob_I_to_E),
+            float(p),
+            float(l),
+        )
+        self._table = transition_table(self._p)
+
+        # Susceptible nodes pull contacts from the nodes that can reach them
+        if self.graph.is_directed():
+            self._pull_indptr, self._pull_indices = self._build_csr(reverse=True)
+        else:
+            self._pull_indptr, self._pull_indices = self.indptr, self.indices
+
+        self._cuda = None
+        self._next_states = self._active = self._next_active = None
+        self._pull_degree = self._rng_buf = None
+        if device == "cuda":
+            # Graph, states and random draws live in GPU memory. Imported here so that
+            # CPU-only runs never import CuPy
+            from ._cuda import CudaStepper
+
+            self._cuda = CudaStepper(self._pull_indptr, self._pull_indices, self._p, self._table)
+            return
+
+        # Double buffers for synchronous updates
+        self._next_states = np.empty_like(self._states)
+        self._active = np.zeros(len(self._states), dtype=np.bool_)
+        self._next_active = np.empty_like(self._active)
+
+        # Uniform draws of one step: two per active node, then one per CSR entry
+        self._pull_degree = np.diff(self._pull_indptr)
+        self._rng_buf = np.empty(2 * len(self._states) + len(self._pull_indices), dtype=np.float64)
 
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -96,69 +164,125 @@ class SEIZModel(BaseEpidemicModel):
             skeptic_frac: Fraction of initially skeptic agents
             seed: Random seed for reproducibility
         """
-        if seed is not None:
-            random.seed(seed)
+        self.rng = np.random.default_rng(seed)
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        order = self.rng.permutation(len(self._nodes_orig))
+        n = len(order)
 
         # Reset all to susceptible
-        for node in nodes:
-            self.states[node] = "S"
+        self._states[:] = S
 
         # Set infected
         n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.states[nodes[i]] = "I"
+        self._states[order[:n_infected]] = I
 
         # Set skeptics
         n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.states[nodes[i]] = "Z"
+        self._states[order[n_infected : n_infected + n_skeptic]] = Z
+
+        if self._cuda is not None:
+            self._cuda.upload(self._states, seed=int(self.rng.integers(2**63 - 1)))
+        else:
+            self._init_active()
+
+    def _init_active(self) -> None:
+        """
+        Flag the nodes that can change state in the next step.
+
+        These are the exposed and infected nodes and the neighbors of the
+        infected and skeptic nodes. The step kernel keeps the flags up to date.
+        """
+        states = self._states
+        self._active[:] = (states == E) | (states == I)
+        spreaders = (states == I) | (states == Z)
+        self._active[self.indices[np.repeat(spreaders, np.diff(self.indptr))]] = True
 
     def step(self) -> None:
         """Execute one simulation step using synchronous update."""
-        proposals = defaultdict(list)
-
-        # --- Contact-based transitions ---
-        for node, state in self.states.items():
-            # Infectious contacts (S-I)
-            if state == "I":
-                for neighbor in self.graph.neighbors(node):
-                    if self.states[neighbor] == "S" and random.random() < self.prob_contact_I:
-                        if random.random() < self.p:
-                            proposals[neighbor].append("I")
-                        else:
-                            proposals[neighbor].append("E")
-
-            # Skeptic contacts (S-Z)
-            elif state == "Z":
-                for neighbor in self.graph.neighbors(node):
-                    if self.states[neighbor] == "S" and random.random() < self.prob_contact_Z:
-                        if random.random() < self.l:
-                            proposals[neighbor].append("Z")
-                        else:
-                            proposals[neighbor].append("E")
-
-        # --- Internal progressions (E <-> I) ---
-        for node, state in self.states.items():
-            if state == "E" and random.random() < self.prob_E_to_I:
-                proposals[node].append("I")
-            elif state == "I" and random.random() < self.prob_I_to_E:
-                proposals[node].append("E")
-
-        # --- Apply updates synchronously ---
-        for node, plist in proposals.items():
-            # If multiple proposals, choose one randomly
-            chosen = random.choice(plist)
-            self.states[node] = chosen
-
-    def get_states(self) -> Dict[Any, str]:
+        if self._cuda is not None:
+            self._cuda.step()
+            return
+
+        active_idx = np.flatnonzero(self._active)
+        edge_offsets = np.zeros(len(active_idx) + 1, dtype=np.int64)
+        np.cumsum(self._pull_degree[active_idx], out=edge_offsets[1:])
+
+        n_node_draws = 2 * len(active_idx)
+        rnd = self._rng_buf[: n_node_draws + edge_offsets[-1]]
+        self.rng.random(out=rnd)
+
+        np.copyto(self._next_states, self._states)
+        self._next_active[:] = False
+        seiz_step_kernel(
+            self._pull_indptr,
+            self._pull_indices,
+            self.indptr,
+            self.indices,
+            active_idx,
+            edge_offsets,
+            self._states,
+            self._next_states,
+            self._next_active,
+            self._p,
+            self._table,
+            rnd[:n_node_draws].reshape(-1, 2),
+            rnd[n_node_draws:],
+        )
+        self._states, self._next_states = self._next_states, self._states
+        self._active, self._next_active = self._next_active, self._active
+
+    def get_states_array(self) -> np.ndarray:
         """
-        Get current states of all agents.
+        Get current states of all agents as an int8 array.
+
+        On the GPU the states are first copied back to the host array.
+
+        Returns:
+            Read-only view of the state array (0=S, 1=E, 2=I, 3=Z)
+        """
+        if self._cuda is not None:
+            self._cuda.download(self._states)
+        view = self._states.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def states(self):
+        """
+        Current state of every agent, kept for compatibility with the old attribute.
+
+        The dictionary is a snapshot built by get_states(): it is read-only on the
+        model, and edits to it do not change the simulation.
 
         Returns:
             Dictionary mapping node -> state
         """
-        return dict(self.states)
+        return self.get_states()
+
+    def _count_states_fast(self) -> np.ndarray:
+        """
+        Count the number of agents in each state without building any dict.
+
+        On the GPU the counts are computed on the device and only the four
+        totals are copied back.
+
+        Returns:
+            Array with the counts of S, E, I, Z (in this order)
+        """
+        if self._cuda is not None:
+            return self._cuda.count_states()
+        return super()._count_states_fast()
+
+    @classmethod
+    def _ensemble_context(cls) -> multiprocessing.context.BaseContext:
+        """
+        Compile the step kernel before the ensemble workers are started.
+
+        Forked workers inherit the kernel compiled in the parent instead of each
+        paying the JIT cost; spawned workers load it from the on-disk cache.
+
+        Returns:
+            Multiprocessing context for the ensemble workers
+        """
+        warm_up()
+        return super()._ensemble_context()
@@ -6,18 +6,18 @@ that can intervene on infected agents.
 """
 
 import random
-from typing import Any, Dict, Optional
+from typing import Optional
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from .base import BaseAgent, BaseEpidemicModel, E, I, S, Z
 
 
-class Agent:
+class Agent(BaseAgent):
     """Simple agent with state information."""
 
-    def __init__(self, state: str = "S"):
-        self.state = state
+    __slots__ = ()
 
 
 class SEIZBMModel(BaseEpidemicModel):
@@ -44,6 +44,8 @@ class SEIZBMModel(BaseEpidemicModel):
         m: Probability moderated I returns to S
     """
 
+    __slots__ = ("beta", "b", "rho", "p", "epsilon", "l", "mu", "m")
+
     def __init__(
         self,
         graph: nx.Graph,
@@ -92,8 +94,8 @@ class SEIZBMModel(BaseEpidemicModel):
         self.m = m
 
         # Initialize agents
-        for node in self.graph.nodes():
-            self.graph.nodes[node]["agent"] = Agent("S")
+        for idx, node in enumerate(self._nodes_orig):
+            self.graph.nodes[node]["agent"] = Agent(self._states, idx, "S")
 
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -109,79 +111,69 @@ class SEIZBMModel(BaseEpidemicModel):
         if seed is not None:
             random.seed(seed)
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        order = list(range(len(self._nodes_orig)))
+        random.shuffle(order)
+        n = len(order)
 
         # Reset all to susceptible
-        for node in nodes:
-            self.graph.nodes[node]["agent"].state = "S"
+        self._states[:] = S
 
         # Set infected
         n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.graph.nodes[nodes[i]]["agent"].state = "I"
+        self._states[order[:n_infected]] = I
 
         # Set skeptics
         n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.graph.nodes[nodes[i]]["agent"].state = "Z"
+        self._states[order[n_infected : n_infected + n_skeptic]] = Z
 
     def step(self) -> None:
         """Execute one simulation step."""
+        states = self._states.tolist()
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
         new_states = {}
 
-        for node in self.graph.nodes():
-            agent = self.graph.nodes[node]["agent"]
-            state = agent.state
-
-            if state == "S":
+        for idx, state in enumerate(states):
+            if state == S:
                 # Check for contacts with infected or skeptic neighbors
-                neighbors = list(self.graph.neighbors(node))
-                for neighbor in neighbors:
-                    nb_state = self.graph.nodes[neighbor]["agent"].state
+                for nb in indices[indptr[idx] : indptr[idx + 1]]:
+                    nb_state = states[nb]
 
-                    if nb_state == "I" and random.random() < self.beta:
-                        new_states[node] = "I" if random.random() < self.p else "E"
+                    if nb_state == I and random.random() < self.beta:
+                        new_states[idx] = I if random.random() < self.p else E
                         break
-                    elif nb_state == "Z" and random.random() < self.b:
-                        new_states[node] = "Z" if random.random() < self.l else "E"
+                    elif nb_state == Z and random.random() < self.b:
+                        new_states[idx] = Z if random.random() < self.l else E
                         break
 
-            elif state == "E":
+            elif state == E:
                 # Transition to infected based on epsilon rate
                 if random.random() < self.epsilon:
-                    new_states[node] = "I"
+                    new_states[idx] = I
                 else:
                     # Or through contact with infected neighbors
-                    neighbors = list(self.graph.neighbors(node))
-                    for neighbor in neighbors:
-                        if (
-                            self.graph.nodes[neighbor]["agent"].state == "I"
-                            and random.random() < self.rho
-                        ):
-                            new_states[node] = "I"
+                    for nb in indices[indptr[idx] : indptr[idx + 1]]:
+                        if states[nb] == I and random.random() < self.rho:
+                            new_states[idx] = I
                             break
 
-            elif state == "I":
+            elif state == I:
                 # Moderator intervention
                 if random.random() < self.mu:
                     if random.random() < self.m:
-                        new_states[node] = "S"
+                        new_states[idx] = S
                     # else stays I (failed moderation)
 
         # Apply state changes
-        for node, new_state in new_states.items():
-            self.graph.nodes[node]["agent"].state = new_state
+        self._states[list(new_states.keys())] = list(new_states.values())
 
-    def get_states(self) -> Dict[Any, str]:
+    def get_states_array(self) -> np.ndarray:
         """
-        Get current states of all agents.
+        Get current states of all agents as an int8 array.
 
         Returns:
-            Dictionary mapping node -> state
+            Read-only view of the state array (0=S, 1=E, 2=I, 3=Z)
         """
-        states = {}
-        for node in self.graph.nodes():
-            states[node] = self.graph.nodes[node]["agent"].state
-        return states
+        view = self._states.view()
+        view.flags.writeable = False
+        return view
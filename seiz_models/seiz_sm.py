@@ -7,18 +7,21 @@ that uses agent profiles (Dark Triad traits) and message toxicity tracking.
 
 import random
 from collections import defaultdict
-from typing import Any, Dict, Optional
+from typing import Optional
 
 import networkx as nx
+import numpy as np
 
-from .base import BaseEpidemicModel
+from .base import BaseAgent, BaseEpidemicModel, E, I, S, Z
 
 
-class Agent:
+class Agent(BaseAgent):
     """Agent with Dark Triad profile and message tracking."""
 
-    def __init__(self, state: str = "S"):
-        self.state = state
+    __slots__ = ("profile", "toxic_messages", "activity_level")
+
+    def __init__(self, states: np.ndarray, idx: int, state: str = "S"):
+        super().__init__(states, idx, state)
         # Dark Triad profile: [Narcissism, Machiavellianism, Psychopathy]
         self.profile = [random.random(), random.random(), random.random()]
         self.toxic_messages = 0  # Count of toxic messages sent
@@ -54,6 +57,8 @@ class SEIZSMModel(BaseEpidemicModel):
         lambd: Probability of E -> Z transition
     """
 
+    __slots__ = ("beta", "b", "rho", "p", "epsilon", "l", "n", "theta", "T", "eta", "lambd")
+
     def __init__(
         self,
         graph: nx.Graph,
@@ -114,8 +119,8 @@ class SEIZSMModel(BaseEpidemicModel):
         self.lambd = lambd
 
         # Initialize agents with profiles
-        for node in self.graph.nodes():
-            self.graph.nodes[node]["agent"] = Agent("S")
+        for idx, node in enumerate(self._nodes_orig):
+            self.graph.nodes[node]["agent"] = Agent(self._states, idx, "S")
 
     def initialize_states(
         self, infected_frac: float = 0.05, skeptic_frac: float = 0.05, seed: Optional[int] = None
@@ -131,27 +136,25 @@ class SEIZSMModel(BaseEpidemicModel):
         if seed is not None:
             random.seed(seed)
 
-        nodes = list(self.graph.nodes())
-        random.shuffle(nodes)
-        n = len(nodes)
+        order = list(range(len(self._nodes_orig)))
+        random.shuffle(order)
+        n = len(order)
 
         # Reset all to susceptible and regenerate profiles
-        for node in nodes:
-            agent = self.graph.nodes[node]["agent"]
-            agent.state = "S"
+        self._states[:] = S
+        for idx in order:
+            agent = self.graph.nodes[self._nodes_orig[idx]]["agent"]
             agent.profile = [random.random(), random.random(), random.random()]
             agent.toxic_messages = 0
             agent.activity_level = 0
 
         # Set infected
         n_infected = int(n * infected_frac)
-        for i in range(n_infected):
-            self.graph.nodes[nodes[i]]["agent"].state = "I"
+        self._states[order[:n_infected]] = I
 
         # Set skeptics
         n_skeptic = int(n * skeptic_frac)
-        for i in range(n_infected, n_infected + n_skeptic):
-            self.graph.nodes[nodes[i]]["agent"].state = "Z"
+        self._states[order[n_infected : n_infected + n_skeptic]] = Z
 
     def compute_toxicity(self, agent: Agent) -> float:
         """
@@ -191,15 +194,16 @@ class SEIZSMModel(BaseEpidemicModel):
         Returns:
             List of nodes that sent toxic messages
         """
-        nodes = list(self.graph.nodes())
-        senders = random.sample(nodes, min(self.n, len(nodes)))
+        n_nodes = len(self._nodes_orig)
+        senders = random.sample(range(n_nodes), min(self.n, n_nodes))
         toxic_senders = []
 
-        for sender in senders:
+        for idx in senders:
+            sender = self._nodes_orig[idx]
             agent = self.graph.nodes[sender]["agent"]
             agent.activity_level += 1
 
-            if agent.state == "I":
+            if self._states[idx] == I:
                 toxicity = self.compute_toxicity(agent)
                 if toxicity >= self.T:
                     agent.toxic_messages += 1
@@ -215,28 +219,28 @@ class SEIZSMModel(BaseEpidemicModel):
         Args:
             toxic_senders: List of nodes that sent toxic messages
         """
+        states = self._states
+        node_idx = self._node_idx
         for sender in toxic_senders:
-            for neighbor in self.graph.neighbors(sender):
-                nb_agent = self.graph.nodes[neighbor]["agent"]
-
-                if nb_agent.state == "S":
+            for nb in self.neighbors(node_idx[sender]).tolist():
+                if states[nb] == S:
                     if random.random() < self.beta:
-                        nb_agent.state = "I" if random.random() < self.p else "E"
+                        states[nb] = I if random.random() < self.p else E
 
-                elif nb_agent.state == "E":
+                elif states[nb] == E:
                     if random.random() < self.rho:
-                        nb_agent.state = "I"
+                        states[nb] = I
 
     def internal_transitions(self) -> None:
         """Handle E -> I and E -> Z transitions."""
-        for node in self.graph.nodes():
-            agent = self.graph.nodes[node]["agent"]
-
-            if agent.state == "E":
+        states = self._states
+        # Each node only updates itself, so iterating a snapshot is equivalent
+        for idx, state in enumerate(states.tolist()):
+            if state == E:
                 if random.random() < self.epsilon:
-                    agent.state = "I"
+                    states[idx] = I
                 elif random.random() < self.lambd:
-                    agent.state = "Z"
+                    states[idx] = Z
 
     def step(self) -> None:
         """Execute one simulation step."""
@@ -244,14 +248,13 @@ class SEIZSMModel(BaseEpidemicModel):
         self.spread_toxicity(toxic_senders)
         self.internal_transitions()
 
-    def get_states(self) -> Dict[Any, str]:
+    def get_states_array(self) -> np.ndarray:
         """
-        Get current states of all agents.
+        Get current states of all agents as an int8 array.
 
         Returns:
-            Dictionary mapping node -> state
+            Read-only view of the state array (0=S, 1=E, 2=I, 3=Z)
         """
-        states = {}
-        for node in self.graph.nodes():
-            states[node] = self.graph.nodes[node]["agent"].state
-        return states
+        view = self._states.view()
+        view.flags.writeable = False
+        return view
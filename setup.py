@@ -1,6 +1,13 @@
 """Setup script for SEIZ epidemic models package."""
 
-from setuptools import setup, find_packages
+from setuptools import Extension, find_packages, setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # Cython is optional, the step kernel then runs on Numba or NumPy
+    cythonize = None
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -8,6 +15,37 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+
+class OptionalBuildExt(build_ext):
+    """Build the C step kernel if possible; the package works without it."""
+
+    errors = (CCompilerError, ExecError, PlatformError)
+
+    def run(self):
+        try:
+            super().run()
+        except self.errors as exc:
+            self.warn(f"C extensions not built, using the pure Python kernels: {exc}")
+
+    def build_extensions(self):
+        self.check_extensions_list(self.extensions)
+        for ext in list(self.extensions):
+            try:
+                self.build_extension(ext)
+            except self.errors as exc:
+                self.warn(f"{ext.name} not built, using the pure Python kernels: {exc}")
+                # Keep the failed extension out of the installed outputs
+                self.extensions.remove(ext)
+
+
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(
+        [Extension("seiz_models._cykernels", ["seiz_models/_cykernels.pyx"])],
+        language_level=3,
+        compiler_directives={"boundscheck": False, "wraparound": False},
+    )
+
 setup(
     name="seiz-models",
     version="0.1.0",
@@ -40,6 +78,8 @@ setup(
     keywords="epidemic-models, information-spread, social-networks, moderation, seiz",
     python_requires=">=3.8",
     install_requires=requirements,
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
     extras_require={
         "dev": [
             "pytest>=7.0",
@@ -51,5 +91,9 @@ setup(
         "animation": [
             "pillow>=9.0.0",
         ],
+        "fast": [
+            "orjson>=3.6.0",
+            "numba>=0.57.0",
+        ],
     },
 )
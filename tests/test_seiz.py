@@ -4,12 +4,17 @@ Unit tests for the basic SEIZ model.
 
 import json
 import os
+import subprocess
+import sys
 import tempfile
 import unittest
+from unittest import mock
 
 import networkx as nx
+import numpy as np
 
-from seiz_models import SEIZModel
+from seiz_models import SEIZModel, _cuda, _kernels, base
+from seiz_models.seiz import SEIZParams
 
 
 class TestSEIZModel(unittest.TestCase):
@@ -62,6 +67,18 @@ class TestSEIZModel(unittest.TestCase):
 
         self.assertEqual(states1, states2)
 
+    def test_run_reproducibility(self):
+        """Test that same seed produces the same trajectory."""
+        model1 = SEIZModel(self.graph, **self.params)
+        model1.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=42)
+        history1 = model1.run(steps=20)
+
+        model2 = SEIZModel(self.graph, **self.params)
+        model2.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=42)
+        history2 = model2.run(steps=20)
+
+        self.assertEqual(history1, history2)
+
     def test_step(self):
         """Test that step executes without error."""
         model = SEIZModel(self.graph, **self.params)
@@ -96,6 +113,103 @@ class TestSEIZModel(unittest.TestCase):
             total = h["S"] + h["E"] + h["I"] + h["Z"]
             self.assertEqual(total, 50)
 
+    def test_run_history_every(self):
+        """Test subsampling the recorded history."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        history = model.run(steps=22, history_every=5)
+
+        # Final state is always recorded
+        self.assertEqual([h["step"] for h in history], [0, 5, 10, 15, 20, 22])
+        for h in history:
+            self.assertEqual(h["S"] + h["E"] + h["I"] + h["Z"], 50)
+
+        data = json.loads(model.to_json(history_every=10))
+        self.assertEqual([h["step"] for h in data["history"]], [0, 10, 20, 22])
+
+        with self.assertRaises(ValueError):
+            model.run(steps=5, history_every=0)
+        with self.assertRaises(ValueError):
+            model.run(steps=-1)
+
+    def test_history_before_run(self):
+        """Test that history is empty until the simulation is run."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        self.assertEqual(model.history, [])
+        with self.assertRaises(ValueError):
+            model.save_plot("unused.png")
+
+    def test_history_assignment(self):
+        """Test that history is cached per run and can be assigned."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        history = model.run(steps=5)
+
+        self.assertIs(model.history, history)
+
+        model.history = history[:3]
+        self.assertEqual(model.history, history[:3])
+        data = json.loads(model.to_json())
+        self.assertEqual(data["history"], history[:3])
+
+        model.run(steps=2)
+        self.assertEqual(len(model.history), 3)
+        self.assertIsNot(model.history, history)
+
+    def test_history_in_place_edits(self):
+        """Test that exports follow in-place edits of the returned history."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        history = model.run(steps=3)
+        history.pop()
+        history[0]["S"] = 999
+
+        data = json.loads(model.to_json())
+        self.assertEqual(data["history"], model.history)
+        self.assertEqual(len(data["history"]), 3)
+        self.assertEqual(data["history"][0]["S"], 999)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save_plot(os.path.join(tmp, "history.png"))
+
+        history.clear()
+        with self.assertRaises(ValueError):
+            model.plot()
+
+    def test_run_ensemble(self):
+        """Test running independent simulations in worker processes."""
+        results = SEIZModel.run_ensemble(
+            self.graph, n_runs=4, steps=10, params=self.params, n_workers=2, seed=7
+        )
+
+        self.assertEqual(results.shape, (4, 11, 4))
+        self.assertTrue((results.sum(axis=2) == 50).all())
+
+        # Same master seed gives the same ensemble
+        again = SEIZModel.run_ensemble(
+            self.graph, n_runs=4, steps=10, params=self.params, n_workers=2, seed=7
+        )
+        self.assertTrue((results == again).all())
+
+        with self.assertRaises(ValueError):
+            SEIZModel.run_ensemble(self.graph, n_runs=0, steps=10, params=self.params)
+
+    @unittest.skipUnless(_kernels.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_ensemble_worker_caps_numba_threads(self):
+        """Test that ensemble workers limit Numba's thread pool to their share of cores."""
+        import numba
+
+        with mock.patch("numba.set_num_threads") as set_num_threads:
+            base._init_ensemble_worker(SEIZModel, self.graph, self.params, 1)
+        set_num_threads.assert_called_once_with(1)
+
+        with mock.patch("numba.set_num_threads") as set_num_threads:
+            base._init_ensemble_worker(SEIZModel, self.graph, self.params, 10**6)
+        set_num_threads.assert_called_once_with(numba.config.NUMBA_NUM_THREADS)
+
     def test_count_states(self):
         """Test state counting."""
         model = SEIZModel(self.graph, **self.params)
@@ -109,6 +223,18 @@ class TestSEIZModel(unittest.TestCase):
         self.assertIn("Z", counts)
         self.assertEqual(sum(counts.values()), 50)
 
+    def test_count_states_matches_get_states(self):
+        """Test that array-based counts agree with the materialized states."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        model.run(steps=5)
+
+        states = list(model.get_states().values())
+        counts = model.count_states()
+
+        for state in ["S", "E", "I", "Z"]:
+            self.assertEqual(counts[state], states.count(state))
+
     def test_to_json(self):
         """Test JSON export."""
         model = SEIZModel(self.graph, **self.params)
@@ -134,6 +260,16 @@ class TestSEIZModel(unittest.TestCase):
         # Check history
         self.assertEqual(len(data["history"]), 11)
 
+    def test_to_json_indent(self):
+        """Test that every indentation level yields the same document."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        model.run(steps=10)
+
+        expected = json.loads(model.to_json())
+        for indent in [None, 4]:
+            self.assertEqual(json.loads(model.to_json(indent=indent)), expected)
+
     def test_save_json(self):
         """Test saving JSON to file."""
         model = SEIZModel(self.graph, **self.params)
@@ -155,6 +291,35 @@ class TestSEIZModel(unittest.TestCase):
         finally:
             os.unlink(filepath)
 
+    def test_save_plot(self):
+        """Test saving the trend plot without importing pyplot."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+        model.run(steps=5)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "plot.png")
+            model.save_plot(filepath, dpi=50)
+            self.assertGreater(os.path.getsize(filepath), 0)
+
+    def test_import_does_not_load_matplotlib(self):
+        """Test that importing the package does not import matplotlib."""
+        code = "import sys, seiz_models; sys.exit('matplotlib' in sys.modules)"
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo_root)
+        self.assertEqual(result.returncode, 0)
+
+    def test_import_does_not_load_cupy(self):
+        """Test that CuPy is only imported when a model runs on the GPU."""
+        code = (
+            "import sys, networkx, seiz_models; "
+            "seiz_models.SEIZModel(networkx.path_graph(3), 0.1, 0.1, 0.1, 0.1, 0.5, 0.5); "
+            "sys.exit('seiz_models._cuda' in sys.modules or 'cupy' in sys.modules)"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo_root)
+        self.assertEqual(result.returncode, 0)
+
     def test_get_states(self):
         """Test retrieving agent states."""
         model = SEIZModel(self.graph, **self.params)
@@ -165,6 +330,193 @@ class TestSEIZModel(unittest.TestCase):
         self.assertEqual(len(states), 50)
         self.assertTrue(all(s in ["S", "E", "I", "Z"] for s in states.values()))
 
+    def test_neighbors(self):
+        """Test that the CSR adjacency matches the graph neighbors."""
+        model = SEIZModel(self.graph, **self.params)
+
+        for idx, node in enumerate(self.graph.nodes()):
+            expected = [model._node_idx[nb] for nb in self.graph.neighbors(node)]
+            self.assertEqual(model.neighbors(idx).tolist(), expected)
+
+    def test_neighbors_relabeled(self):
+        """Test that arbitrary node labels are mapped to contiguous indices."""
+        graph = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a"), ("a", "c")])
+        model = SEIZModel(graph, **self.params)
+
+        self.assertEqual(model._nodes_orig, ["a", "b", "c"])
+        self.assertEqual(model.indices.dtype, np.int32)
+        self.assertEqual(model.neighbors(0).tolist(), [1, 2])
+        self.assertEqual(model.neighbors(2).tolist(), [0])
+
+        model.initialize_states(infected_frac=0.0, skeptic_frac=0.0, seed=1)
+        self.assertEqual(model.get_states(), {"a": "S", "b": "S", "c": "S"})
+
+    def test_kernels_agree(self):
+        """Test that all step kernels give the same states and frontier."""
+        model = SEIZModel(self.graph, **self.params)
+        rng = np.random.default_rng(0)
+        states = rng.integers(0, 4, size=50).astype(np.int8)
+        active_idx = np.flatnonzero(rng.random(50) < 0.7)
+        edge_offsets = np.concatenate(([0], np.cumsum(np.diff(model.indptr)[active_idx])))
+        params = SEIZParams(0.5, 0.4, 0.2, 0.1, 0.5, 0.4)
+        rnd_node = rng.random((len(active_idx), 2))
+        rnd_edge = rng.random(edge_offsets[-1])
+
+        kernels = [
+            _kernels._seiz_step_serial,
+            _kernels._seiz_step_parallel,
+            _kernels._seiz_step_numpy,
+        ]
+        if _kernels.CYTHON_AVAILABLE:
+            kernels.append(_kernels._seiz_step_cython)
+
+        outputs = []
+        for kernel in kernels:
+            states_out = states.copy()
+            active_out = np.zeros(50, dtype=bool)
+            kernel(
+                model.indptr,
+                model.indices,
+                model.indptr,
+                model.indices,
+                active_idx,
+                edge_offsets,
+                states,
+                states_out,
+                active_out,
+                params,
+                _kernels.transition_table(params),
+                rnd_node,
+                rnd_edge,
+            )
+            outputs.append((states_out, active_out))
+
+        for states_out, active_out in outputs[1:]:
+            np.testing.assert_array_equal(outputs[0][0], states_out)
+            np.testing.assert_array_equal(outputs[0][1], active_out)
+
+    def test_active_nodes(self):
+        """Test that the frontier holds every node that can change state."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        for _ in range(5):
+            states = model.get_states_array()
+            spreaders = (states == 2) | (states == 3)
+            expected = (states == 1) | (states == 2)
+            for idx in range(50):
+                if states[idx] == 0 and spreaders[model.neighbors(idx)].any():
+                    expected[idx] = True
+            np.testing.assert_array_equal(model._active & expected, expected)
+            model.step()
+
+    def test_parallel_dispatch(self):
+        """Test that the parallel kernel gives the same trajectory as the serial one."""
+        histories = []
+        for threshold in (len(self.graph), 0):
+            with mock.patch.object(_kernels, "PARALLEL_THRESHOLD", threshold):
+                model = SEIZModel(self.graph, **self.params)
+                model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=5)
+                histories.append(model.run(steps=10))
+
+        self.assertEqual(histories[0], histories[1])
+
+    @unittest.skipUnless(_kernels.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_ensemble_after_parallel_step(self):
+        """Test that ensembles run after a parallel step do not hang the process."""
+        code = (
+            "import networkx as nx\n"
+            "from seiz_models import SEIZBMModel, SEIZModel, _kernels\n"
+            "if __name__ == '__main__':\n"
+            "    _kernels.PARALLEL_THRESHOLD = 0\n"
+            "    graph = nx.erdos_renyi_graph(50, 0.1, seed=42)\n"
+            "    model = SEIZModel(graph, 0.3, 0.2, 0.2, 0.1, 0.5, 0.4)\n"
+            "    model.initialize_states(seed=1)\n"
+            "    model.run(steps=3)\n"
+            "    params = dict(beta=0.3, b=0.1, rho=0.2, p=0.5, epsilon=0.2, l=0.3, mu=0.1, m=0.5)\n"
+            "    SEIZBMModel.run_ensemble(graph, 2, 5, params, n_workers=2, seed=1)\n"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=repo_root, timeout=300)
+        self.assertEqual(result.returncode, 0)
+
+    def test_transition_table(self):
+        """Test that the transition table reproduces the transition probabilities."""
+        params = SEIZParams(0.5, 0.4, 0.2, 0.1, 0.7, 0.4)
+        table = _kernels.transition_table(params)
+        draws = (np.arange(10_000) + 0.5) / 10_000
+
+        def frequencies(state, source):
+            new_states = (draws[:, None] >= table[state, source, :3]).sum(axis=1)
+            return np.bincount(new_states, minlength=4) / len(draws)
+
+        np.testing.assert_allclose(frequencies(0, 0), [1, 0, 0, 0])
+        np.testing.assert_allclose(frequencies(0, 1), [0, 0.3, 0.7, 0])
+        np.testing.assert_allclose(frequencies(0, 2), [0, 0.6, 0, 0.4])
+        np.testing.assert_allclose(frequencies(1, 0), [0, 0.8, 0.2, 0])
+        np.testing.assert_allclose(frequencies(2, 0), [0, 0.1, 0.9, 0])
+        np.testing.assert_allclose(frequencies(3, 0), [0, 0, 0, 1])
+
+    def test_device(self):
+        """Test the validation of the simulation device."""
+        with self.assertRaises(ValueError):
+            SEIZModel(self.graph, device="tpu", **self.params)
+
+        if not _cuda.CUPY_AVAILABLE:
+            with self.assertRaises(ImportError):
+                SEIZModel(self.graph, device="cuda", **self.params)
+
+    @unittest.skipUnless(_cuda.CUPY_AVAILABLE, "CuPy is not installed")
+    def test_run_cuda(self):
+        """Test running the simulation on the GPU."""
+        model = SEIZModel(self.graph, device="cuda", **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        history = model.run(steps=20)
+
+        self.assertEqual(len(history), 21)
+        for h in history:
+            self.assertEqual(h["S"] + h["E"] + h["I"] + h["Z"], 50)
+        self.assertEqual(sum(model.count_states().values()), 50)
+        self.assertEqual(len(model.get_states()), 50)
+
+    def test_slots(self):
+        """Test that models use slots instead of a per-instance dict."""
+        model = SEIZModel(self.graph, **self.params)
+
+        self.assertFalse(hasattr(model, "__dict__"))
+        with self.assertRaises(AttributeError):
+            model.undeclared = 1
+
+    def test_states_property(self):
+        """Test the read-only states attribute."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        self.assertEqual(model.states, model.get_states())
+        with self.assertRaises(AttributeError):
+            model.states = {}
+
+        snapshot = model.states
+        snapshot[0] = "E" if snapshot[0] != "E" else "S"
+        self.assertNotEqual(model.states, snapshot)
+
+    def test_get_states_array(self):
+        """Test the read-only array view of agent states."""
+        model = SEIZModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.1, skeptic_frac=0.1, seed=123)
+
+        states = model.get_states_array()
+
+        self.assertEqual(states.dtype, np.int8)
+        self.assertEqual(len(states), 50)
+        self.assertEqual(
+            [model.get_states()[node] for node in self.graph.nodes()],
+            ["SEIZ"[code] for code in states],
+        )
+        with self.assertRaises(ValueError):
+            states[0] = 1
+
     def test_empty_graph(self):
         """Test behavior with empty graph."""
         empty_graph = nx.Graph()
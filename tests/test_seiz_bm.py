@@ -6,6 +6,7 @@ import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 import networkx as nx
 
@@ -204,6 +205,30 @@ class TestSEIZBMModel(unittest.TestCase):
             agent = self.graph.nodes[node]["agent"]
             self.assertIn(agent.state, ["S", "E", "I", "Z"])
 
+    def test_run_ensemble(self):
+        """Test that ensemble runs are reproducible from the master seed."""
+        kwargs = dict(n_runs=3, steps=5, params=self.params, n_workers=2, seed=11)
+        results = SEIZBMModel.run_ensemble(self.graph, **kwargs)
+
+        self.assertEqual(results.shape, (3, 6, 4))
+        self.assertTrue((results == SEIZBMModel.run_ensemble(self.graph, **kwargs)).all())
+
+    def test_ensemble_context_avoids_fork_with_numba_threads(self):
+        """Test that ensemble workers are spawned once Numba threads may be running."""
+        with mock.patch("seiz_models.base._numba_threads_started", return_value=True):
+            self.assertEqual(SEIZBMModel._ensemble_context().get_start_method(), "spawn")
+
+    def test_agent_state_shared_with_model(self):
+        """Test that agent state changes are reflected in model counts."""
+        model = SEIZBMModel(self.graph, **self.params)
+        model.initialize_states(infected_frac=0.0, skeptic_frac=0.0, seed=123)
+
+        node = next(iter(self.graph.nodes()))
+        self.graph.nodes[node]["agent"].state = "I"
+
+        self.assertEqual(model.count_states()["I"], 1)
+        self.assertEqual(model.get_states()[node], "I")
+
 
 if __name__ == "__main__":
     unittest.main()